@@ -1,5 +1,5 @@
 from src.regular.regular_expression import (
-    RegularExpression, Symbol, EmptyString, EmptySet, RegexUnion, RegexConcat, RegexKleeneStar, make_union, make_concat, make_kleene_star
+    RegularExpression, Symbol, EmptyString, EmptySet, EPS, EMPTY, RegexUnion, RegexConcat, RegexKleeneStar, make_union, make_concat, make_kleene_star
 )
 from src.regular.fsa import (
     FSA, DFA, NFA, make_fsa, make_dfa, make_nfa, make_moore_machine, make_mealy_machine
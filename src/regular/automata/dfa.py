@@ -1,4 +1,3 @@
-from src.regular.regular_expression import EmptySet, Symbol, make_union
 from src.regular.fsa_base import FSA
 from src.regular.regex_convertible import RegexConvertible
 
@@ -6,19 +5,139 @@ class DFA(FSA, RegexConvertible):
     """
         Deterministic Finite Automaton.
     """
+    def __init__(self, alphabet=None, transitions=None, start_state=None, final_states=None):
+        super().__init__(alphabet, transitions, start_state, final_states)
+        self._build_table()
+
+    def _build_table(self):
+        self._compile_transitions()
+        self._accept = [state in self.final_states for state in self._state_names]
+        self._build_dead_states()
+        self._build_byte_table()
+
+    def _build_dead_states(self):
+        """
+            Mark states from which the run can neither accept nor raise: no
+            final state and no incomplete row is reachable. Found by a reverse
+            search from the final states and from the states with a missing
+            transition, which includes states absent from delta. Rejecting
+            early in a dead state is only sound once the input is validated.
+        """
+        reverse: list[list[int]] = [[] for _ in self._state_names]
+        for i, row in enumerate(self._table):
+            for target in row:
+                if target >= 0:
+                    reverse[target].append(i)
+
+        live = [
+            accept or state not in self.delta or -1 in row
+            for state, accept, row in zip(self._state_names, self._accept, self._table)
+        ]
+        stack = [i for i, is_live in enumerate(live) if is_live]
+        while stack:
+            for source in reverse[stack.pop()]:
+                if not live[source]:
+                    live[source] = True
+                    stack.append(source)
+        self._dead = [not is_live for is_live in live]
+
+    def _build_byte_table(self):
+        """
+            Rows indexed by byte value, for alphabets of single Latin-1 characters.
+            Invalid symbols and missing transitions lead to an extra error state,
+            which stops the run like a dead state does.
+        """
+        if not all(isinstance(symbol, str) and len(symbol) == 1 and ord(symbol) < 256 for symbol in self.alphabet):
+            self._byte_table = None
+            return
+
+        error = len(self._state_names)
+        self._byte_table: list[list[int]] = []
+        for row in self._table:
+            byte_row = [error] * 256
+            for symbol, code in self._symbol_id.items():
+                if row[code] >= 0:
+                    byte_row[ord(symbol)] = row[code]
+            self._byte_table.append(byte_row)
+        self._byte_table.append([error] * 256)
+        self._byte_stop = self._dead + [True]
+        self._has_dead = any(self._dead)
+
+    def _invalid_symbol(self, s: str, ch: str) -> ValueError:
+        # The first invalid symbol reached is its first occurrence.
+        return ValueError(f"invalid input symbol at pos {s.index(ch)}: '{ch}' not in alphabet {sorted(self.alphabet)}")
+
     def step(self, state: str, symbol: str) -> str:
-        if state not in self.delta:
-            raise ValueError(f"Unknown state: {state}")
-        if symbol not in self.alphabet:
-            raise ValueError(f"Symbol '{symbol}' not in alphabet {sorted(self.alphabet)}")
-        if symbol not in self.delta[state]:
-            raise ValueError(f"No transition from state '{state}' on symbol '{symbol}'")
-        return self.delta[state][symbol]
+        return self._deterministic_step(state, symbol)
 
     def accepts(self, s: str) -> bool:
-        state = self.start
-        for i, ch in enumerate(s):
-            if ch not in self.alphabet:
-                raise ValueError(f"invalid input symbol at pos {i}: '{ch}' not in alphabet {sorted(self.alphabet)}")
-            state = self.step(state, ch)
-        return state in self.final_states
+        if self._byte_table is not None:
+            data = self._valid_bytes(s)
+            if data is not None:
+                return self._accepts_bytes(data, s)
+        return self._accepts_table(s)
+
+    def _accepts_bytes(self, data: bytes, s: str) -> bool:
+        rows = self._byte_table
+        state = self._start_id
+        if not self._has_dead:
+            # Only the error state can trap the run, and it absorbs every byte,
+            # so the loop needs no per-step check.
+            for code in data:
+                state = rows[state][code]
+        else:
+            stop = self._byte_stop
+            if stop[state]:
+                return False
+            for code in data:
+                state = rows[state][code]
+                if stop[state]:
+                    break
+        if state == len(self._state_names):
+            # A missing transition: let the checked walk raise its error.
+            return self._accepts_checked(s)
+        return self._accept[state]
+
+    def _accepts_table(self, s: str) -> bool:
+        table = self._table
+        symbol_id = self._symbol_id
+        if not symbol_id.keys() >= set(s):
+            return self._accepts_checked(s)
+
+        dead = self._dead
+        state = self._start_id
+        if dead[state]:
+            return False
+        if self._total:
+            for ch in s:
+                state = table[state][symbol_id[ch]]
+                if dead[state]:
+                    return False
+            return self._accept[state]
+        for ch in s:
+            next_state = table[state][symbol_id[ch]]
+            if next_state < 0:
+                next_state = self._missing_transition(state, ch)
+            state = next_state
+            if dead[state]:
+                return False
+        return self._accept[state]
+
+    def _accepts_checked(self, s: str) -> bool:
+        """
+            Symbol-by-symbol walk without early rejection, for inputs that
+            raise: reports the first invalid symbol or missing transition
+            in input order.
+        """
+        table = self._table
+        symbol_id = self._symbol_id
+        state = self._start_id
+        for ch in s:
+            code = symbol_id.get(ch)
+            if code is None:
+                raise self._invalid_symbol(s, ch)
+            next_state = table[state][code]
+            if next_state < 0:
+                next_state = self._missing_transition(state, ch)
+            state = next_state
+        return self._accept[state]
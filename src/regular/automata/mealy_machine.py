@@ -13,28 +13,20 @@ class MealyMachine(FSA):
     ):
         super().__init__(alphabet, transitions, start_state)
         if output is None:
-            self.output = {state: "" for state in self.get_states()}
+            self.output = {state: {} for state in self.get_states()}
         else:
             self.output = dict(output)
-
-    def get_output(self, state: str) -> str:
-        """
-            Get output for a given state.
-        """
-        return self.output.get(state, "")
+        self._compile_transitions()
+        self._out = [
+            [self.get_output(state, symbol) for symbol in self._symbol_id]
+            for state in self._state_names
+        ]
 
     def step(self, state: str, symbol: str) -> tuple[str, str]:
         """
             Return the next state and the output symbol
         """
-        if state not in self.delta:
-            raise ValueError(f"Unknown state: {state}")
-        if symbol not in self.alphabet:
-            raise ValueError(f"Symbol '{symbol}' not in alphabet {sorted(self.alphabet)}")
-        if symbol not in self.delta[state]:
-            raise ValueError(f"No transition from state '{state}' on symbol '{symbol}'")
-        
-        next_state = self.delta[state][symbol]
+        next_state = self._deterministic_step(state, symbol)
         output_symbol = self.get_output(state, symbol)
 
         return next_state, output_symbol
@@ -42,7 +34,6 @@ class MealyMachine(FSA):
     def get_output(self, state: str, symbol: str) -> str:
         """
             Get output for a given state and input symbol.
-            Overrides defualt FSA implementation.
         """
         return self.output.get(state, {}).get(symbol, "")
 
@@ -50,12 +41,28 @@ class MealyMachine(FSA):
         """
             Process input string and return list of outputs.
         """
+        table = self._table
+        symbol_id = self._symbol_id
+        out = self._out
+        state = self._start_id
         outputs = []
-        state = self.start
+
+        if self._total:
+            try:
+                for symbol in input_str:
+                    code = symbol_id[symbol]
+                    outputs.append(out[state][code])
+                    state = table[state][code]
+            except KeyError:
+                self._missing_transition(state, symbol)
+            return outputs
 
         for symbol in input_str:
-            state, output_symbol = self.step(state, symbol)
-            outputs.append(output_symbol)
+            code = symbol_id.get(symbol)
+            if code is None or table[state][code] < 0:
+                self._missing_transition(state, symbol)
+            outputs.append(out[state][code])
+            state = table[state][code]
 
         return outputs
     
@@ -63,4 +70,4 @@ class MealyMachine(FSA):
         """
             Placeholder: Mealy Machines are not acceptors
         """
-        raise NotImplementedError("Moore Machines are not acceptors")
+        raise NotImplementedError("Mealy Machines are not acceptors")
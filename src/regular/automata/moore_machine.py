@@ -17,6 +17,8 @@ class MooreMachine(FSA):
             self.output = {state: "" for state in self.get_states()}
         else:
             self.output = dict(output)
+        self._compile_transitions()
+        self._out = [self.get_output(state) for state in self._state_names]
 
     def get_output(self, state: str) -> str:
         """
@@ -28,27 +30,37 @@ class MooreMachine(FSA):
         """
             Return the next state.
         """
-        if state not in self.delta:
-            raise ValueError(f"Unknown state: {state}")
-        if symbol not in self.alphabet:
-            raise ValueError(f"Symbol '{symbol}' not in alphabet {sorted(self.alphabet)}")
-        if symbol not in self.delta[state]:
-            raise ValueError(f"No transition from state '{state}' on symbol '{symbol}'")
-        
-        return self.delta[state][symbol]
+        return self._deterministic_step(state, symbol)
 
     def process_input(self, input_str: str) -> list[str]:
         """
             Process input string and return list of outputs.
         """
-        outputs = [self.get_output(self.start)]
-        state = self.start
+        table = self._table
+        symbol_id = self._symbol_id
+        state = self._start_id
+        visited = [state]
+
+        if self._total:
+            try:
+                for symbol in input_str:
+                    state = table[state][symbol_id[symbol]]
+                    visited.append(state)
+            except KeyError:
+                self._missing_transition(state, symbol)
+            out = self._out
+            return [out[i] for i in visited]
 
         for symbol in input_str:
-            state = self.step(state, symbol)
-            outputs.append(self.get_output(state))
+            code = symbol_id.get(symbol)
+            next_state = -1 if code is None else table[state][code]
+            if next_state < 0:
+                next_state = self._missing_transition(state, symbol)
+            state = next_state
+            visited.append(state)
 
-        return outputs
+        out = self._out
+        return [out[i] for i in visited]
 
     def accepts(self, string: str) -> bool:
         """
@@ -1,14 +1,23 @@
-from src.regular.regular_expression import EmptySet, Symbol
+from functools import cached_property
+
 from src.regular.fsa_base import FSA
 from src.regular.regex_convertible import RegexConvertible
 
 class NFA(FSA, RegexConvertible):
     """
         Non-deterministic Finite Automaton.
+
+        Sets of active states are simulated as integer bitmasks,
+        one bit per state.
     """
+    SUBSET_CACHE_LIMIT = 1 << 16
+    # Each lazy subset DFA node holds 257 slots, so far fewer of them are kept.
+    SUBSET_NODE_LIMIT = 1 << 10
+
     def __init__(self, alphabet=None, transitions=None, start_state=None, final_states=None):
         super().__init__(alphabet, transitions, start_state, final_states)
         self._normalize_transitions()
+        self._build_masks()
 
     def _normalize_transitions(self):
         for state in self.delta:
@@ -18,20 +27,82 @@ class NFA(FSA, RegexConvertible):
                 else:
                     self.delta[state][symbol] = set(self.delta[state][symbol])
 
-    def epsilon_closure(self, states: set[str]) -> set[str]:
-        closure = set(states)
-        stack = list(states)
-        while stack:
-            state = stack.pop()
-            if state not in self.delta or '' not in self.delta[state]:
-                continue
-            for next_state in self.delta[state]['']:
-                if next_state in closure:
-                    continue
-                closure.add(next_state)
-                stack.append(next_state)
+    def _build_masks(self):
+        """
+            Assign a bit to every state and precompute per-symbol transition masks.
+        """
+        states = dict.fromkeys(self.delta)
+        states[self.start] = None
+        for transitions in self.delta.values():
+            for targets in transitions.values():
+                states.update(dict.fromkeys(targets))
+        states.update(dict.fromkeys(self.final_states))
+
+        self._states = list(states)
+        self._state_bit = {state: 1 << i for i, state in enumerate(self._states)}
+
+        n = len(self._states)
+        self._delta_mask: dict[str, list[int]] = {}
+        self._B: dict[str, int] = {}
+        for state, transitions in self.delta.items():
+            i = self._state_bit[state].bit_length() - 1
+            for symbol, targets in transitions.items():
+                row = self._delta_mask.setdefault(symbol, [0] * n)
+                row[i] = self._states_to_mask(targets)
+                self._B[symbol] = self._B.get(symbol, 0) | row[i]
+
+        # Epsilon transitions are static: close every single state once.
+        eps_row = self._delta_mask.get('', [0] * n)
+        self._eps_mask: list[int] = []
+        for i in range(n):
+            closure = frontier = 1 << i
+            while frontier:
+                low = frontier & -frontier
+                frontier ^= low
+                new = eps_row[low.bit_length() - 1] & ~closure
+                closure |= new
+                frontier |= new
+            self._eps_mask.append(closure)
+        self._eps = {
+            state: frozenset(self._mask_to_states(mask))
+            for state, mask in zip(self._states, self._eps_mask)
+        }
+
+        self._final_mask = self._states_to_mask(self.final_states)
+        self._subset_trans: dict[tuple[int, str], int] = {}
+        self._subset_nodes: dict[int, list] = {}
+        self._start_mask = self._eps_mask[self._state_bit[self.start].bit_length() - 1]
+
+    def _states_to_mask(self, states) -> int:
+        mask = 0
+        for state in states:
+            mask |= self._state_bit.get(state, 0)
+        return mask
+
+    def _mask_to_states(self, mask: int) -> set[str]:
+        states = set()
+        while mask:
+            low = mask & -mask
+            states.add(self._states[low.bit_length() - 1])
+            mask ^= low
+        return states
+
+    def _epsilon_closure_mask(self, mask: int) -> int:
+        """
+            Epsilon closure of a state mask as the union of per-state closures.
+        """
+        eps_mask = self._eps_mask
+        closure = 0
+        while mask:
+            low = mask & -mask
+            closure |= eps_mask[low.bit_length() - 1]
+            mask ^= low
         return closure
 
+    def epsilon_closure(self, states: set[str]) -> set[str]:
+        eps = self._eps
+        return set().union(*(eps.get(state, (state,)) for state in states))
+
     def step(self, state: str, symbol: str) -> set[str]:
         if state not in self.delta:
             return set()
@@ -41,18 +112,117 @@ class NFA(FSA, RegexConvertible):
             return set()
         return self.delta[state][symbol]
 
+    def step_nfa_mask(self, mask: int, symbol: str) -> int:
+        """
+            Advance a state mask on a symbol, including epsilon closure.
+            Results are memoized per (mask, symbol), so repeated runs
+            converge to a lazily built subset-construction DFA.
+        """
+        key = (mask, symbol)
+        next_mask = self._subset_trans.get(key)
+        if next_mask is not None:
+            return next_mask
+
+        row = self._delta_mask.get(symbol)
+        next_mask = 0
+        if row is not None:
+            while mask:
+                low = mask & -mask
+                next_mask |= row[low.bit_length() - 1]
+                mask ^= low
+            next_mask = self._epsilon_closure_mask(next_mask)
+
+        if len(self._subset_trans) >= self.SUBSET_CACHE_LIMIT:
+            self._subset_trans.clear()
+        self._subset_trans[key] = next_mask
+        return next_mask
+
+    def _subset_node(self, mask: int) -> list | None:
+        """
+            Node of the lazily built byte-indexed subset DFA: slots 0-255 hold
+            the successor node per input byte once computed, slot 256 the mask.
+            Returns None for a new mask once SUBSET_NODE_LIMIT nodes exist.
+        """
+        node = self._subset_nodes.get(mask)
+        if node is None and len(self._subset_nodes) < self.SUBSET_NODE_LIMIT:
+            node = self._subset_nodes[mask] = [None] * 256 + [mask]
+        return node
+
+    @cached_property
+    def _step_rows(self) -> list[list[int] | None]:
+        """
+            Per input byte, the ε-closed successor mask of every single state,
+            for walks that outgrow the subset DFA. Closure distributes over
+            union, so a step is the OR of the rows of the active states.
+        """
+        n = len(self._states)
+        rows: list[list[int] | None] = [None] * 256
+        for code in self._alpha_bytes:
+            row = self._delta_mask.get(chr(code), [0] * n)
+            rows[code] = [self._epsilon_closure_mask(targets) for targets in row]
+        return rows
+
+    def _walk_step_rows(self, mask: int, codes) -> int:
+        """
+            Advance a state mask over validated input bytes without caching.
+        """
+        step_rows = self._step_rows
+        for code in codes:
+            row = step_rows[code]
+            next_mask = 0
+            while mask:
+                low = mask & -mask
+                next_mask |= row[low.bit_length() - 1]
+                mask ^= low
+            if not next_mask:
+                return 0
+            mask = next_mask
+        return mask
+
     def step_nfa(self, states: set[str], symbol: str) -> set[str]:
-        next_states = set()
-        for state in states:
-            next_states.update(self.step(state, symbol))
-        return self.epsilon_closure(next_states)
+        if symbol not in self.alphabet:
+            raise ValueError(f"symbol '{symbol}' not in alphabet {sorted(self.alphabet)}")
+        mask = self.step_nfa_mask(self._states_to_mask(states), symbol)
+        return self._mask_to_states(mask)
+
+    def accepts(self, s: str) -> bool:
+        data = self._valid_bytes(s)
+        if data is not None:
+            # Walk the byte-indexed subset DFA, extending it on first use.
+            # Once it is full, the rest of the input takes the uncached row walk.
+            codes = iter(data)
+            node = self._subset_node(self._start_mask)
+            if node is None:
+                return bool(self._walk_step_rows(self._start_mask, codes) & self._final_mask)
+            for code in codes:
+                next_node = node[code]
+                if next_node is None:
+                    next_mask = self.step_nfa_mask(node[256], chr(code))
+                    if not next_mask:
+                        return False
+                    next_node = self._subset_node(next_mask)
+                    if next_node is None:
+                        return bool(self._walk_step_rows(next_mask, codes) & self._final_mask)
+                    node[code] = next_node
+                node = next_node
+            return bool(node[256] & self._final_mask)
 
-    def accepts(self, s: str) -> str:
-        curr_states = self.epsilon_closure({self.start})
+        curr_mask = self._start_mask
+        subset_trans = self._subset_trans
+        B = self._B
+        alpha_lut = self._alpha_lut
         for i, ch in enumerate(s):
-            if ch not in self.alphabet:
+            try:
+                valid = alpha_lut[ord(ch)]
+            except (IndexError, TypeError):
+                valid = ch in self.alphabet
+            if not valid:
                 raise ValueError(f"invalid input symbol at pos {i}: '{ch}' not in alphabet {sorted(self.alphabet)}")
-            curr_states = self.step_nfa(curr_states, ch)
-            if not curr_states:
-                return False 
-        return bool(curr_states & self.final_states)
+            if not B.get(ch, 0):
+                return False
+            # Inline hit path of step_nfa_mask's subset cache.
+            next_mask = subset_trans.get((curr_mask, ch))
+            curr_mask = self.step_nfa_mask(curr_mask, ch) if next_mask is None else next_mask
+            if not curr_mask:
+                return False
+        return bool(curr_mask & self._final_mask)
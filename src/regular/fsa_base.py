@@ -1,19 +1,27 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 
 class FSA(ABC):
     def __init__(self, alphabet=None, transitions=None, start_state=None, final_states=None):
         if alphabet is None:
-            self.alphabet = {'a', 'b'}
+            self.alphabet = frozenset({'a', 'b'})
         else:
-            self.alphabet = set(alphabet)
+            self.alphabet = frozenset(alphabet)
+        # Byte lookup table for single-character symbols below U+0100.
+        self._alpha_lut = bytearray(256)
+        for symbol in self.alphabet:
+            if isinstance(symbol, str) and len(symbol) == 1 and ord(symbol) < 256:
+                self._alpha_lut[ord(symbol)] = 1
+        # The same byte set for bytes.translate, see _valid_bytes.
+        self._alpha_bytes = bytes(code for code in range(256) if self._alpha_lut[code])
         if start_state is None:
             self.start = 'S'
         else:
             self.start = start_state
         if final_states is None:
-            self.final_states = {'F'}
+            self.final_states = frozenset({'F'})
         else:
-            self.final_states = set(final_states)
+            self.final_states = frozenset(final_states)
         if transitions is None:
             self.delta = {
                 'S': {'a': 'A', 'b': 'F'},
@@ -24,10 +32,78 @@ class FSA(ABC):
         else:
             self.delta = transitions
 
+    def _deterministic_step(self, state: str, symbol: str) -> str:
+        """
+            Validated lookup of a single deterministic transition.
+        """
+        if state not in self.delta:
+            raise ValueError(f"Unknown state: {state}")
+        if symbol not in self.alphabet:
+            raise ValueError(f"Symbol '{symbol}' not in alphabet {sorted(self.alphabet)}")
+        if symbol not in self.delta[state]:
+            raise ValueError(f"No transition from state '{state}' on symbol '{symbol}'")
+        return self.delta[state][symbol]
+
+    def _valid_bytes(self, s: str) -> bytes | None:
+        """
+            Latin-1 bytes of s if every symbol is in the alphabet, else None.
+        """
+        try:
+            data = s.encode('latin-1')
+        except (AttributeError, UnicodeEncodeError):
+            return None
+        # Deleting every alphabet byte leaves nothing iff all symbols are valid.
+        if data.translate(None, self._alpha_bytes):
+            return None
+        return data
+
+    def _compile_transitions(self):
+        """
+            Compile a deterministic delta into a dense table indexed by
+            state id and symbol id. Missing transitions are marked with -1.
+        """
+        states = dict.fromkeys(self.delta)
+        states[self.start] = None
+        for transitions in self.delta.values():
+            states.update(dict.fromkeys(transitions.values()))
+
+        self._state_names = list(states)
+        self._state_id = {state: i for i, state in enumerate(self._state_names)}
+        self._symbol_id = {symbol: i for i, symbol in enumerate(self.alphabet)}
+
+        self._table = [[-1] * len(self._symbol_id) for _ in self._state_names]
+        for state, transitions in self.delta.items():
+            row = self._table[self._state_id[state]]
+            for symbol, target in transitions.items():
+                if symbol in self._symbol_id:
+                    row[self._symbol_id[symbol]] = self._state_id[target]
+
+        self._start_id = self._state_id[self.start]
+        # Total transition functions let the hot loops skip the missing-transition check.
+        self._total = all(target >= 0 for row in self._table for target in row)
+
+    def _missing_transition(self, state: int, symbol: str) -> int:
+        # step() raises the descriptive error for the missing transition.
+        return self._state_id[self.step(self._state_names[state], symbol)]
+
     @abstractmethod
     def accepts(self, s: str) -> bool:
         pass
 
+    def accepts_batch(self, strings: Iterable[str]) -> list[bool]:
+        """
+            Test many strings at once, running each distinct string only once.
+        """
+        accepts = self.accepts
+        results: dict[str, bool] = {}
+        accepted = []
+        for s in strings:
+            result = results.get(s)
+            if result is None:
+                result = results[s] = accepts(s)
+            accepted.append(result)
+        return accepted
+
     @abstractmethod
     def step(self, state: str, symbol: str):
         pass
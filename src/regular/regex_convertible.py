@@ -1,63 +1,84 @@
-from src.regular.regular_expression import EmptySet, EmptyString, RegularExpression, Symbol, make_concat, make_kleene_star, make_union
+import heapq
+
+from src.regular.regular_expression import EMPTY, EPS, RegularExpression, Symbol, make_concat, make_kleene_star, make_union
 
 class RegexConvertible:
     """
         Mixin for regex conversion.
     """
     def to_regex(self) -> RegularExpression:
-        states = self.get_states()
-        R: dict[str, dict[str, RegularExpression]] = {}
-        for state1 in states:
-            R[state1] = {}
-            for state2 in states:
-                R[state1][state2] = EmptySet()
+        # Number the states once so R can be a 2D list indexed by state id.
+        state_id = {state: i for i, state in enumerate(self.get_states())}
+        for transitions in self.delta.values():
+            for target in transitions.values():
+                for to_state in (target if isinstance(target, set) else (target,)):
+                    state_id.setdefault(to_state, len(state_id))
+        start = state_id.setdefault(self.start, len(state_id))
+        finals = [state_id.setdefault(state, len(state_id)) for state in self.final_states]
+        if not finals:
+            return EMPTY
+        n = len(state_id) + (len(finals) > 1)
+
+        R: list[list[RegularExpression]] = [[EMPTY] * n for _ in range(n)]
         for from_state, transitions in self.delta.items():
+            i = state_id[from_state]
             for symbol, target in transitions.items():
-                if symbol == '':
-                    symbol_regex = EmptyString()
-                else:
-                    symbol_regex = Symbol(symbol)
-                if hasattr(self, 'step') and callable(getattr(self, 'step', None)) and not isinstance(target, set):
-                    to_state = target
-                    curr_symbol = R[from_state][to_state]
-                    if isinstance(curr_symbol, EmptySet):
-                        R[from_state][to_state] = symbol_regex
-                    else:
-                        R[from_state][to_state] = make_union(curr_symbol, symbol_regex)
-                else:
-                    for to_state in target:
-                        curr_symbol = R[from_state][to_state]
-                        if isinstance(curr_symbol, EmptySet):
-                            R[from_state][to_state] = symbol_regex
-                        else:
-                            R[from_state][to_state] = make_union(curr_symbol, symbol_regex)
-        if len(self.final_states) > 1:
-            new_final_state = "F_new"
-            states.add(new_final_state)
-            R[new_final_state] = {}
-            for state in states:
-                if state != new_final_state:
-                    R[state][new_final_state] = EmptySet()
-                R[new_final_state][state] = EmptySet()
-            for final_state in self.final_states:
-                R[final_state][new_final_state] = EmptyString()
-            final_state = new_final_state
+                symbol_regex = EPS if symbol == '' else Symbol(symbol)
+                for to_state in (target if isinstance(target, set) else (target,)):
+                    j = state_id[to_state]
+                    R[i][j] = make_union(R[i][j], symbol_regex)
+        if len(finals) > 1:
+            # Single new final state reached from the old ones by epsilon.
+            final = n - 1
+            for i in finals:
+                R[i][final] = EPS
         else:
-            final_state = next(iter(self.final_states))
-        elimination_order = [state for state in states if state not in (self.start, final_state)]
-        for k in elimination_order:
-            remaining_states = [state for state in states if state != k]
-            for i in remaining_states:
-                for j in remaining_states:
-                    old_path = R[i][j]
-                    new_path = make_concat(
-                        make_concat(R[i][k], make_kleene_star(R[k][k])),
-                        R[k][j]
-                    )
-                    R[i][j] = make_union(old_path, new_path)
+            final = finals[0]
+
+        # Eliminate states greedily by fewest fill-in edges: removing k creates
+        # up to in_deg(k) * out_deg(k) new paths, each carrying a starred term.
+        states = set(range(n))
+        in_deg = [0] * n
+        out_deg = [0] * n
+        for i in range(n):
+            for j in range(n):
+                if i != j and R[i][j] is not EMPTY:
+                    out_deg[i] += 1
+                    in_deg[j] += 1
+        heap = [(in_deg[k] * out_deg[k], k) for k in range(n) if k not in (start, final)]
+        heapq.heapify(heap)
+        while heap:
+            cost, k = heapq.heappop(heap)
+            if k not in states or cost != in_deg[k] * out_deg[k]:
+                continue  # stale heap entry
             states.remove(k)
-        start_loop = R[self.start][self.start]
-        direct_path = R[self.start][final_state]
-        if isinstance(start_loop, EmptySet):
-            return direct_path
-        return make_concat(make_kleene_star(start_loop), direct_path)
+            # Only paths i -> k -> j through non-empty edges change R[i][j].
+            R_k = R[k]
+            in_k = [i for i in states if R[i][k] is not EMPTY]
+            out_k = [j for j in states if R_k[j] is not EMPTY]
+            loop_k = make_kleene_star(R_k[k])
+            for i in in_k:
+                R_i = R[i]
+                through_k = make_concat(R_i[k], loop_k)
+                for j in out_k:
+                    old_path = R_i[j]
+                    R_i[j] = make_union(old_path, make_concat(through_k, R_k[j]))
+                    if i != j and old_path is EMPTY:
+                        out_deg[i] += 1
+                        in_deg[j] += 1
+            for i in in_k:
+                out_deg[i] -= 1
+            for j in out_k:
+                in_deg[j] -= 1
+            for i in set(in_k) | set(out_k):
+                if i not in (start, final):
+                    heapq.heappush(heap, (in_deg[i] * out_deg[i], i))
+
+        start_loop = R[start][start]
+        if start == final:
+            return make_kleene_star(start_loop)
+        # Two states left: (R_ss | R_sf R_ff* R_fs)* R_sf R_ff*
+        final_loop = make_kleene_star(R[final][final])
+        to_final = make_concat(R[start][final], final_loop)
+        start_loop = make_union(start_loop, make_concat(to_final, R[final][start]))
+        return make_concat(make_kleene_star(start_loop), to_final)
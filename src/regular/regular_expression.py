@@ -2,11 +2,32 @@
 Regular expression classes
 """
 from abc import ABC, abstractmethod
+from weakref import WeakValueDictionary
+
+# Hash-consing caches for the smart constructors below. Keys are built from
+# the ids of the (already hash-consed) children, which stay valid for as long
+# as the cached node holds a reference to them.
+_union_cache: WeakValueDictionary = WeakValueDictionary()
+_concat_cache: WeakValueDictionary = WeakValueDictionary()
+_kleene_star_cache: WeakValueDictionary = WeakValueDictionary()
+
+# Node kind tags, compared instead of isinstance checks on hot paths.
+_TAG_EMPTY_SET = 0
+_TAG_EMPTY_STRING = 1
+_TAG_SYMBOL = 2
+_TAG_UNION = 3
+_TAG_CONCAT = 4
+_TAG_KLEENE_STAR = 5
 
 class RegularExpression(ABC):
     """
-        Abstract class for regexes
+        Abstract class for regexes.
+
+        Equality and hashing are by identity: leaves are interned and
+        the make_* factories share structurally equal composite nodes.
     """
+    __slots__ = ()
+    _TAG: int
 
     @abstractmethod
     def __str__(self):
@@ -18,41 +39,73 @@ class RegularExpression(ABC):
 
 class Symbol(RegularExpression):
     """
-        Single terminal symbol
+        Single terminal symbol.
+        Instances are interned per symbol, so equal symbols are identical.
     """
-
-    def __init__(self, symbol: str):
-        self.symbol = symbol
+    __slots__ = ('symbol', '__weakref__')
+    _TAG = _TAG_SYMBOL
+    # Weak, like the composite caches: symbols nobody references are dropped.
+    _cache: WeakValueDictionary = WeakValueDictionary()
+
+    def __new__(cls, symbol: str):
+        instance = cls._cache.get(symbol)
+        if instance is None:
+            instance = super().__new__(cls)
+            object.__setattr__(instance, 'symbol', symbol)
+            cls._cache[symbol] = instance
+        return instance
+
+    def __setattr__(self, name, value):
+        # Instances are shared, so changing one would change every use.
+        raise AttributeError(f"cannot assign to '{name}' of interned Symbol")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"cannot delete '{name}' of interned Symbol")
+
+    def __reduce__(self):
+        # Copies and unpickled symbols go back through the intern pool.
+        return (Symbol, (self.symbol,))
 
     def __str__(self):
         return self.symbol
     
-    def __eq__(self, other) -> bool:
-        return isinstance(other, Symbol) and self.symbol == other.symbol
-    
 
 class EmptyString(RegularExpression):
     """
-        Empty string (epsilon)
+        Empty string (epsilon) - a singleton, see EPS.
     """
+    __slots__ = ()
+    _TAG = _TAG_EMPTY_STRING
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
 
     def __str__(self) -> str:
         return "\u03b5"  # Unicode for ε
     
-    def __eq__(self, other) -> bool:
-        return isinstance(other, EmptyString)
-    
 
 class EmptySet(RegularExpression):
     """
-        Empty set (∅) - accepts nothing.
+        Empty set (∅) - accepts nothing. A singleton, see EMPTY.
     """
+    __slots__ = ()
+    _TAG = _TAG_EMPTY_SET
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
 
     def __str__(self) -> str:
         return "\u2205"  # Unicode for ∅
-    
-    def __eq__(self, other) -> bool:
-        return isinstance(other, EmptySet)
+
+
+EPS = EmptyString()
+EMPTY = EmptySet()
 
 
 class RegexUnion(RegularExpression):
@@ -60,36 +113,49 @@ class RegexUnion(RegularExpression):
         RegexUnion of two expressions (L_1|L_2)
     """
 
+    __slots__ = ('left', 'right', '_str', '__weakref__')
+    _TAG = _TAG_UNION
+
     def __init__(self, left: RegularExpression, right: RegularExpression):
         self.left = left
         self.right = right
+        self._str = None
 
     def __str__(self) -> str:
-        if isinstance(self.left, EmptySet):
-            return str(self.right)
-        if isinstance(self.right, EmptySet):
-            return str(self.left)
-        if self.left == self.right:
-            return str(self.left)
-        
-        left_str = _strip_parantheses(str(self.left))
-        right_str = _strip_parantheses(str(self.right))
+        # Nodes are immutable once built, so the rendering is cached.
+        rendered = self._str
+        if rendered is None:
+            rendered = _render_tree(self)
+        return rendered
 
-        return f"({left_str}|{right_str})"
+    def _render(self) -> str:
+        expr = _simplified(self)
+        if expr is not self:
+            return str(expr)
+        return f"({_alternatives_str(self.left)}|{_alternatives_str(self.right)})"
 
 
 def make_union(left: RegularExpression, right: RegularExpression) -> RegularExpression:
     """
-        Make RegexUnion of two expressions
+        Make RegexUnion of two expressions.
+        Nested unions are flattened, duplicate alternatives dropped
+        and the result is shared with structurally equal unions.
     """
-    if isinstance(left, EmptySet):
+    if left is EMPTY:
         return right
-    if isinstance(right, EmptySet):
+    if right is EMPTY:
         return left
-    if left == right:
+    if left is right:
         return left
-    
-    return RegexUnion(left, right)
+
+    # Nodes hash by identity, which for interned leaves and hash-consed
+    # composites coincides with structural equality.
+    alternatives = list(dict.fromkeys(_union_alternatives(left, right)))
+
+    union = alternatives[0]
+    for alternative in alternatives[1:]:
+        union = _hash_cons(_union_cache, (id(union), id(alternative)), RegexUnion, union, alternative)
+    return union
 
 
 class RegexConcat(RegularExpression):
@@ -97,35 +163,39 @@ class RegexConcat(RegularExpression):
         Concatenation of two expressions (L_1L_2)
     """
 
+    __slots__ = ('left', 'right', '_str', '__weakref__')
+    _TAG = _TAG_CONCAT
+
     def __init__(self, left: RegularExpression, right: RegularExpression):
         self.left = left
         self.right = right
+        self._str = None
 
     def __str__(self) -> str:
-        if isinstance(self.left, EmptyString):
-            return str(self.right)
-        if isinstance(self.right, EmptyString):
-            return str(self.left)
-        if isinstance(self.left, EmptySet) or isinstance(self.right, EmptySet):
-            return "\u2205" # Unicode for ∅
-        
-        left_str = _add_parantheses(self.left)
-        right_str = _add_parantheses(self.right)
+        rendered = self._str
+        if rendered is None:
+            rendered = _render_tree(self)
+        return rendered
 
-        return f"{left_str}{right_str}"
+    def _render(self) -> str:
+        expr = _simplified(self)
+        if expr is not self:
+            return str(expr)
+        # Unions carry their own parentheses and concatenation is associative.
+        return f"{self.left}{self.right}"
 
 
 def make_concat(left: RegularExpression, right: RegularExpression) -> RegularExpression:
     """
         Make Concatenation of two expressions
     """
-    if isinstance(left, EmptyString):
+    if left is EPS:
         return right
-    if isinstance(right, EmptyString):
+    if right is EPS:
         return left
-    if isinstance(left, EmptySet) or isinstance(right, EmptySet):
-        return EmptySet()
-    return RegexConcat(left, right)
+    if left is EMPTY or right is EMPTY:
+        return EMPTY
+    return _hash_cons(_concat_cache, (id(left), id(right)), RegexConcat, left, right)
 
 
 class RegexKleeneStar(RegularExpression):
@@ -133,48 +203,146 @@ class RegexKleeneStar(RegularExpression):
         Kleene Star of an expresions (L_1*)
     """
 
+    __slots__ = ('expr', '_str', '__weakref__')
+    _TAG = _TAG_KLEENE_STAR
+
     def __init__(self, expr: RegularExpression):
         self.expr = expr
+        self._str = None
 
     def __str__(self) -> str:
-        if isinstance(self.expr, EmptyString) or isinstance(self.expr, EmptySet):
+        rendered = self._str
+        if rendered is None:
+            rendered = _render_tree(self)
+        return rendered
+
+    def _render(self) -> str:
+        expr = _star_operand(self.expr)
+        if expr is EPS or expr is EMPTY:
             return "\u03b5"  # ε* = ∅* = ε 
-        
-        if isinstance(self.expr, RegexUnion):
-            left = self.expr.left
-            right = self.expr.right
-            if isinstance(left, EmptyString):
-                return f"{RegexKleeneStar(right)}"
-            elif isinstance(right, EmptyString):
-                return f"{RegexKleeneStar(left)}"
-            
-        expr_str = _add_parantheses(self.expr)
-
-        return f"{expr_str}*"
+        if _needs_parens(expr):
+            return f"({expr})*"
+        return f"{expr}*"
 
 
 def make_kleene_star(regex: RegularExpression) -> RegularExpression:
     """
         Make Kleene Star of an expression
     """
-    if isinstance(regex, (EmptyString, EmptySet)):
-        return EmptyString()
-    return RegexKleeneStar(regex)
+    if regex is EPS or regex is EMPTY:
+        return EPS
+    if regex._TAG == _TAG_KLEENE_STAR:
+        return regex  # (r*)* = r*
+    if regex._TAG == _TAG_UNION:
+        alternatives = _union_alternatives(regex)
+        if EPS in alternatives:
+            # (ε|r)* = r*
+            rest = EMPTY
+            for alternative in alternatives:
+                if alternative is not EPS:
+                    rest = make_union(rest, alternative)
+            return make_kleene_star(rest)
+    return _hash_cons(_kleene_star_cache, id(regex), RegexKleeneStar, regex)
+
+
+def _hash_cons(cache: WeakValueDictionary, key, node_type: type, *children: RegularExpression) -> RegularExpression:
+    """
+        Return the cached node for key, building it on a miss.
+    """
+    node = cache.get(key)
+    if node is None:
+        node = node_type(*children)
+        cache[key] = node
+    return node
 
 
-def _strip_parantheses(expr_str: str) -> str:
+def _render_tree(root: RegularExpression) -> str:
+    """
+        Render every unrendered composite node under root bottom-up with an
+        explicit stack, so each _render only reads cached child strings and
+        deep expressions do not recurse.
+    """
+    stack = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if node._str is not None:
+            continue
+        if children_done:
+            node._str = node._render()
+            continue
+        stack.append((node, True))
+        children = (node.expr,) if node._TAG == _TAG_KLEENE_STAR else (node.right, node.left)
+        for child in children:
+            if child._TAG >= _TAG_UNION and child._str is None:
+                stack.append((child, False))
+    return root._str
+
+
+def _union_alternatives(*exprs: RegularExpression) -> list[RegularExpression]:
+    """
+        Flatten nested unions into the list of their alternatives, left to right.
     """
-        Remove opening and closing parantheses
+    alternatives = []
+    stack = list(reversed(exprs))
+    while stack:
+        expr = stack.pop()
+        if expr._TAG == _TAG_UNION:
+            stack.append(expr.right)
+            stack.append(expr.left)
+        else:
+            alternatives.append(expr)
+    return alternatives
+
+
+def _simplified(expr: RegularExpression) -> RegularExpression:
     """
-    if expr_str.startswith('(') and expr_str.endswith(')') and '|' in expr_str:
-        return expr_str[1:-1]
-    return expr_str
+        The node a raw expression renders as, after dropping ∅ alternatives,
+        repeated alternatives and ε factors.
+    """
+    while True:
+        if expr._TAG == _TAG_UNION:
+            if expr.left is EMPTY:
+                expr = expr.right
+                continue
+            if expr.right is EMPTY or expr.left is expr.right:
+                expr = expr.left
+                continue
+        elif expr._TAG == _TAG_CONCAT:
+            if expr.left is EMPTY or expr.right is EMPTY:
+                return EMPTY
+            if expr.left is EPS:
+                expr = expr.right
+                continue
+            if expr.right is EPS:
+                expr = expr.left
+                continue
+        return expr
+
+
+def _star_operand(expr: RegularExpression) -> RegularExpression:
+    """
+        The operand a Kleene star renders, with ε alternatives dropped: (ε|r)* = r*.
+        Only needed for nodes built directly rather than through make_kleene_star.
+    """
+    expr = _simplified(expr)
+    while expr._TAG == _TAG_UNION and (expr.left is EPS or expr.right is EPS):
+        expr = _simplified(expr.right if expr.left is EPS else expr.left)
+    return expr
 
 
-def _add_parantheses(expr: RegularExpression) -> str:
+def _alternatives_str(expr: RegularExpression) -> str:
     """
-        Add paranthese around an union or concat expresion
+        Render an operand of a union, inlining the alternatives of nested unions.
     """
-    if isinstance(expr, (RegexUnion, RegexConcat)):
-        return f"({str(expr)})"
+    expr = _simplified(expr)
+    if expr._TAG == _TAG_UNION:
+        return str(expr)[1:-1]  # a union always renders as "(alternatives)"
     return str(expr)
+
+
+def _needs_parens(expr: RegularExpression) -> bool:
+    """
+        Whether an operand of a Kleene star must be parenthesized.
+        Unions render their own parentheses.
+    """
+    return _simplified(expr)._TAG in (_TAG_CONCAT, _TAG_KLEENE_STAR)
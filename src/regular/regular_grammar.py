@@ -1,5 +1,7 @@
-from dataclasses import dataclass
+from collections import defaultdict
+from collections.abc import Iterator
 from enum import Enum
+from functools import cached_property
 from typing import Optional
 
 class GrammarType(Enum):
@@ -7,31 +9,75 @@ class GrammarType(Enum):
     LEFT_LINEAR = "left_linear"
 
 
-@dataclass(frozen=True)
 class RegularProduction:
     """
         A production rule in a regular grammar.
         
         For right-linear: A → aB, A → a, or A → ε
         For left-linear: A → Ba, A → a, or A → ε
+
+        Immutable; equality and hashing go through the cached field tuple.
     """
+    __slots__ = ('left_side', 'terminal', 'right_side', 'grammar_type', '_key', '_hash', '_str')
+
     left_side: str # Non-terminal symbol
     terminal: Optional[str]
     right_side: Optional[str]
     grammar_type: GrammarType
 
-    def __post_init__(self):
-        """
-            Validate the production rules.
-        """
-        if self.grammar_type == GrammarType.RIGHT_LINEAR:
-            if self.terminal is None and self.right_side is not None:
-                raise ValueError("Right-linear grammar cannot have variable without terminal (except ε)")
-        elif self.grammar_type == GrammarType.LEFT_LINEAR:
-            if self.terminal is None and self.right_side is not None:
-                raise ValueError("Left-linear grammar cannot have variable without terminal (except ε)")
+    def __init__(
+        self,
+        left_side: str,
+        terminal: Optional[str],
+        right_side: Optional[str],
+        grammar_type: GrammarType
+    ):
+        # Both grammar types share the invariant, so a single check covers them.
+        if terminal is None and right_side is not None:
+            side = "Right" if grammar_type == GrammarType.RIGHT_LINEAR else "Left"
+            raise ValueError(f"{side}-linear grammar cannot have variable without terminal (except ε)")
+
+        set_field = object.__setattr__
+        set_field(self, 'left_side', left_side)
+        set_field(self, 'terminal', terminal)
+        set_field(self, 'right_side', right_side)
+        set_field(self, 'grammar_type', grammar_type)
+        key = (left_side, terminal, right_side, grammar_type)
+        set_field(self, '_key', key)
+        set_field(self, '_hash', hash(key))
+        # Productions are immutable, so they are rendered once.
+        set_field(self, '_str', self._render())
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot assign to field '{name}' of immutable RegularProduction")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"cannot delete field '{name}' of immutable RegularProduction")
+
+    def __reduce__(self):
+        # Rebuild through __init__, since __setattr__ is disabled.
+        return (self.__class__, (self.left_side, self.terminal, self.right_side, self.grammar_type))
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key == other._key
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return (
+            f"RegularProduction(left_side={self.left_side!r}, terminal={self.terminal!r}, "
+            f"right_side={self.right_side!r}, grammar_type={self.grammar_type!r})"
+        )
 
     def __str__(self):
+        return self._str
+
+    def _render(self) -> str:
         if self.terminal is None and self.right_side is None:
             # epsilon production
             return f"{self.left_side} -> epsilon"
@@ -98,9 +144,10 @@ class RegularGrammar:
         start_variable: str,
         grammar_type: GrammarType
     ):
-        self.variables = variables
-        self.terminals = terminals
-        self.productions = productions
+        # Frozen so the indexes built below cannot go stale.
+        self.variables: frozenset[str] = frozenset(variables)
+        self.terminals: frozenset[str] = frozenset(terminals)
+        self.productions: tuple[RegularProduction, ...] = tuple(productions)
         self.start_variable = start_variable
         self.grammar_type = grammar_type
 
@@ -110,11 +157,55 @@ class RegularGrammar:
                 f"Start variable '{self.start_variable}' must be in variables set!"
             )
 
-        if self.variables & self.terminals:
+        if not self.variables.isdisjoint(self.terminals):
             raise ValueError(
                 f"Variables and terminals sets must be disjoint!"
             )
 
+        # Struct-of-arrays view of the productions, used by the scans below.
+        self._prod_left = [prod.left_side for prod in self.productions]
+        self._prod_terminal = [prod.terminal for prod in self.productions]
+        self._prod_right = [prod.right_side for prod in self.productions]
+        self._prod_type = [prod.grammar_type for prod in self.productions]
+
+        # Validate the whole production set with C-level subset checks and
+        # only walk the productions to report the first offending one.
+        terminals_used = {terminal for terminal in self._prod_terminal if terminal is not None}
+        right_sides_used = {right_side for right_side in self._prod_right if right_side is not None}
+        if not (
+            self.variables.issuperset(self._prod_left)
+            and all(grammar_type == self.grammar_type for grammar_type in self._prod_type)
+            and self.terminals.issuperset(terminals_used)
+            and self.variables.issuperset(right_sides_used)
+        ):
+            self._raise_invalid_production()
+
+        self._by_var: dict[str, list[int]] = {}
+        for i, left_side in enumerate(self._prod_left):
+            self._by_var.setdefault(left_side, []).append(i)
+
+        self._nullable = self._compute_nullable()
+        self._derives_epsilon = self.start_variable in self._nullable
+
+        self._variables_sorted = tuple(sorted(self.variables))
+        self._terminals_sorted = tuple(sorted(self.terminals))
+
+    def _compute_nullable(self) -> frozenset[str]:
+        """
+            Variables deriving ε: the left sides of ε-productions.
+        """
+        # RegularProduction rejects unit productions A -> B, and every other
+        # production emits a terminal, so this seed is already the fixpoint.
+        return frozenset(
+            left_side
+            for left_side, terminal, right_side in zip(self._prod_left, self._prod_terminal, self._prod_right)
+            if terminal is None and right_side is None
+        )
+
+    def _raise_invalid_production(self):
+        """
+            Raise for the first production that does not fit the grammar.
+        """
         for prod in self.productions:
             if prod.left_side not in self.variables:
                 raise ValueError(
@@ -137,116 +228,114 @@ class RegularGrammar:
                 )
 
     def __str__(self) -> str:
-        lines: list[str] = []
-        lines.append(f"Regular Grammar {self.grammar_type.value}")
-        lines.append(f"Variables: {','.join(sorted(self.variables))}")
-        lines.append(f"Terminals: {','.join(sorted(self.terminals))}")
-        lines.append(f"Start Variables: {self.start_variable}")
-        lines.append(f"Productions:")
-
-        for prod in self.productions:
-            lines.append(f" {prod}")
-
-        return "\n".join(lines)
+        return self._rendered
+
+    @cached_property
+    def _rendered(self) -> str:
+        # The grammar is immutable, so it is rendered once.
+        return "\n".join([
+            f"Regular Grammar {self.grammar_type.value}",
+            f"Variables: {','.join(self._variables_sorted)}",
+            f"Terminals: {','.join(self._terminals_sorted)}",
+            f"Start Variables: {self.start_variable}",
+            "Productions:",
+            *[f" {prod._str}" for prod in self.productions],
+        ])
 
     def get_produtions_for_variable(self, variable: str) -> list[RegularProduction]:
         """
             Get all productions with the given variable on the left side.
         """
-        return [prod for prod in self.productions if prod.left_side == variable]
+        return [self.productions[i] for i in self._by_var.get(variable, ())]
 
-    def get_nullable_variables(self) -> set[str]:
+    # Correctly spelled name; the original one is kept for existing callers.
+    get_productions_for_variable = get_produtions_for_variable
+
+    def iter_productions_for(self, variable: str) -> Iterator[RegularProduction]:
         """
-            Find all variables that can derive an empty string.
+            Iterate over the productions with the given variable on the left side,
+            without building a list.
         """
-        nullable = set()
+        productions = self.productions
+        return (productions[i] for i in self._by_var.get(variable, ()))
 
-        for prod in self.productions:
-            if prod.is_epsilon_production():
-                nullable.add(prod.left_side)
-
-        return nullable
+    def get_nullable_variables(self) -> frozenset[str]:
+        """
+            Find all variables that can derive an empty string.
+            Computed once at construction.
+        """
+        return self._nullable
 
     def derives_epsilon(self) -> bool:
         """
             Check if the grammar derives an empty string.
         """
-        return self.start_variable in self.get_nullable_variables()
+        return self._derives_epsilon
 
     def is_valid_regular_grammar(self) -> bool:
         """
             Verify that all productions follow the regular grammar format.
+            Construction already rejects any production that does not.
         """
-        try:
-            for prod in self.productions:
-                if prod.grammar_type != self.grammar_type:
-                    return False
-                
-                if self.grammar_type == GrammarType.RIGHT_LINEAR:
-                    if prod.right_side is not None and prod.terminal is None:
-                        return False
-                elif self.grammar_type == GrammarType.LEFT_LINEAR:
-                    if prod.right_side is not None and prod.terminal is None:
-                        return False
-
-            return True
-        except Exception:
-            return False
+        return True
 
     def to_finite_automaton(self):
         """
         Convert regular grammar to an NFA compatible with fsa.py's make_nfa.
+        The grammar is immutable, so the NFA is built once and shared.
+        """
+        return self.nfa
+
+    @cached_property
+    def nfa(self):
         """
+            NFA accepting the language of the grammar.
+        """
+        return self._build_nfa()
+
+    def _build_nfa(self):
         from src.regular.fsa import make_nfa
 
-        states = set(self.variables)
-        alphabet = set(self.terminals)
-        transitions = {v: {} for v in self.variables}
+        # Only states with outgoing transitions get an entry.
+        transitions = defaultdict(lambda: defaultdict(set))
         final_states = set()
 
-        extra_final = None
+        # Terminal productions A -> a all lead to one extra final state.
+        extra_final = "[Final]"
+        if any(
+            terminal is not None and right_side is None
+            for terminal, right_side in zip(self._prod_terminal, self._prod_right)
+        ):
+            final_states.add(extra_final)
 
-        for prod in self.productions:
+        productions = zip(self._prod_left, self._prod_terminal, self._prod_right, self._prod_type)
+        for left_side, terminal, right_side, grammar_type in productions:
             # A -> ε
-            if prod.is_epsilon_production():
-                final_states.add(prod.left_side)
-            elif prod.grammar_type == GrammarType.RIGHT_LINEAR:
+            if terminal is None and right_side is None:
+                final_states.add(left_side)
+            elif grammar_type == GrammarType.RIGHT_LINEAR:
                 # A -> aB
-                if prod.right_side is not None:
-                    transitions[prod.left_side].setdefault(prod.terminal, set()).add(prod.right_side)
+                if right_side is not None:
+                    transitions[left_side][terminal].add(right_side)
                 # A -> a
                 else:
-                    if extra_final is None:
-                        extra_final = "[Final]"
-                        states.add(extra_final)
-                    transitions[prod.left_side].setdefault(prod.terminal, set()).add(extra_final)
-                    final_states.add(extra_final)
-            elif prod.grammar_type == GrammarType.LEFT_LINEAR:
+                    transitions[left_side][terminal].add(extra_final)
+            elif grammar_type == GrammarType.LEFT_LINEAR:
                 # A -> Ba
-                if prod.right_side is not None:
-                    transitions[prod.right_side].setdefault(prod.terminal, set()).add(prod.left_side)
+                if right_side is not None:
+                    transitions[right_side][terminal].add(left_side)
                 # A -> a
                 else:
-                    if extra_final is None:
-                        extra_final = "[FINAL]"
-                        states.add(extra_final)
-                    transitions[prod.left_side].setdefault(prod.terminal, set()).add(extra_final)
-                    final_states.add(extra_final)
-
-        # Normalize transitions
-        for state in transitions:
-            for symbol in transitions[state]:
-                transitions[state][symbol] = set(transitions[state][symbol])
-
-        # Remove empty transitions
-        transitions = {
-            state: transition 
-            for state, transition in transitions.items() 
-            if transition
-        }
+                    transitions[left_side][terminal].add(extra_final)
+
+        # Turn the defaultdicts into plain mappings in place, so lookups on
+        # the NFA cannot insert keys, without copying the table.
+        transitions.default_factory = None
+        for row in transitions.values():
+            row.default_factory = None
 
         return make_nfa(
-            alphabet=alphabet,
+            alphabet=self.terminals,  # FSA keeps its own frozenset and byte lookup table
             transitions=transitions,
             start_state=self.start_variable,
             final_states=final_states
@@ -131,6 +131,15 @@ class TestBasicFSAFunctionalities:
         with pytest.raises(ValueError):
             fsa.accepts('c')
 
+    @pytest.mark.parametrize("automaton", ["simple_dfa", "simple_nfa"])
+    def test_fsa_accepts_batch(self, automaton, request):
+        fsa = request.getfixturevalue(automaton)
+        words = ["", "b", "aab", "ab", "b", "bbb"]
+        assert fsa.accepts_batch(words) == [fsa.accepts(word) for word in words]
+
+        with pytest.raises(ValueError):
+            fsa.accepts_batch(["b", "c"])
+
     @pytest.mark.parametrize("automaton", ["simple_dfa", "simple_nfa"])
     def test_fsa_to_regex_return_regex(self, automaton, request):
         fsa = request.getfixturevalue(automaton)
@@ -145,6 +154,84 @@ class TestBasicFSAFunctionalities:
         assert isinstance(regex_str, str)
         assert len(regex_str) > 0
 
+    def test_dfa_missing_transition_raises(self):
+        dfa = make_dfa(
+            alphabet={'a', 'b'},
+            transitions={'S': {'a': 'F'}, 'F': {'a': 'F'}},
+            start_state='S',
+            final_states={'F'}
+        )
+        assert dfa.accepts('aa')
+        with pytest.raises(ValueError, match="No transition"):
+            dfa.accepts('ab')
+
+    def test_dfa_dead_state_rejects_early(self):
+        dfa = make_dfa(
+            alphabet={'a', 'b'},
+            transitions={
+                'S': {'a': 'F', 'b': 'D'},
+                'F': {'a': 'F', 'b': 'F'},
+                'D': {'a': 'D', 'b': 'D'}
+            },
+            start_state='S',
+            final_states={'F'}
+        )
+        assert dfa.accepts('ab')
+        assert not dfa.accepts('ba')
+        # Rejecting early must not hide invalid symbols later in the input.
+        for word in ('ba!', 'b!'):
+            with pytest.raises(ValueError, match="invalid input symbol at pos"):
+                dfa.accepts(word)
+            with pytest.raises(ValueError, match="invalid input symbol at pos"):
+                dfa.accepts_batch([word])
+
+    def test_dfa_partial_non_accepting_state_still_raises(self):
+        dfa = make_dfa(
+            alphabet={'a', 'b'},
+            transitions={'S': {'a': 'D', 'b': 'F'}, 'D': {'a': 'D'}},
+            start_state='S',
+            final_states={'F'}
+        )
+        assert not dfa.accepts('aa')
+        with pytest.raises(ValueError, match="No transition from state 'D'"):
+            dfa.accepts('ab')
+        with pytest.raises(ValueError, match="No transition from state 'D'"):
+            dfa.accepts_batch(['ab'])
+
+    def test_dfa_unknown_start_state_raises(self):
+        dfa = make_dfa(
+            alphabet={'a'},
+            transitions={'F': {'a': 'F'}},
+            start_state='S',
+            final_states={'F'}
+        )
+        with pytest.raises(ValueError, match="Unknown state"):
+            dfa.accepts('a')
+
+    def test_dfa_accepts_matches_language(self, simple_dfa):
+        for word in ("", "a", "b", "ab", "bab", "abba", "bbbab", "aabbb"):
+            expected = word.count('a') % 2 == 0 and word.count('b') % 2 == 1
+            assert simple_dfa.accepts(word) == expected, word
+
+    def test_to_regex_start_is_final(self):
+        dfa = make_dfa(
+            alphabet={'a'},
+            transitions={'S': {'a': 'S'}},
+            start_state='S',
+            final_states={'S'}
+        )
+        assert str(dfa.to_regex()) == 'a*'
+
+    def test_to_regex_path_back_to_start(self):
+        # S -a-> F -b-> S, so the language is (ab)*a
+        nfa = make_nfa(
+            alphabet={'a', 'b'},
+            transitions={'S': {'a': {'F'}}, 'F': {'b': {'S'}}},
+            start_state='S',
+            final_states={'F'}
+        )
+        assert str(nfa.to_regex()) == '(ab)*a'
+
     def test_regex_basic_functionality(self):
         a = Symbol('a')
         assert str(a) == 'a'
@@ -247,6 +334,35 @@ class TestNFASpecificFunctionalities:
         assert 'q01' in next_states  # q00 -b-> q01
         assert 'q00' in next_states  # q01 -b-> q00
 
+    def test_nfa_step_nfa_closes_over_epsilon(self, epsilon_nfa):
+        start = epsilon_nfa.epsilon_closure({'q0'})
+        assert start == {'q0', 'q1'}
+
+        # {q0, q1} -b-> {q2} -ε-> {q0, q1, q2}
+        assert epsilon_nfa.step_nfa(start, 'b') == {'q0', 'q1', 'q2'}
+        assert epsilon_nfa.accepts('b')
+        assert epsilon_nfa.accepts('abb')
+        assert not epsilon_nfa.accepts('a')
+
+        assert epsilon_nfa.step_nfa(set(), 'a') == set()
+
+    def test_nfa_subset_node_limit_falls_back_to_row_walk(self):
+        # The 3rd symbol from the end is an 'a': 8 reachable subsets.
+        nfa = make_nfa(
+            alphabet={'a', 'b'},
+            transitions={
+                'q0': {'a': {'q0', 'q1'}, 'b': {'q0'}},
+                'q1': {'a': {'q2'}, 'b': {'q2'}},
+                'q2': {'a': {'q3'}, 'b': {'q3'}}
+            },
+            start_state='q0',
+            final_states={'q3'}
+        )
+        nfa.SUBSET_NODE_LIMIT = 2
+        words = ['', 'a', 'abb', 'bab', 'aaab', 'babba', 'abbabab', 'bbbbbbbbabb']
+        for word in words:
+            assert nfa.accepts(word) == (len(word) >= 3 and word[-3] == 'a'), word
+
     def test_nfa_normalization(self):
         nfa = make_nfa(
             alphabet={'a', 'b'},
@@ -284,6 +400,11 @@ class TestMooreMachine:
         with pytest.raises(ValueError):
             simple_moore_machine.process_input("2")
 
+    def test_outputs_for_long_input(self, simple_moore_machine):
+        # S -0-> A -0-> S -1-> B -0-> B -1-> S
+        outputs = simple_moore_machine.process_input("00101")
+        assert outputs == ['x', 'y', 'x', 'z', 'z', 'x']
+
     def test_output_for_unknown_state(self, simple_moore_machine):
         assert simple_moore_machine.get_output("Q") == ""
 
@@ -309,5 +430,10 @@ class TestMealyMachine:
         with pytest.raises(ValueError):
             simple_mealy_machine.process_input("2")
 
+    def test_outputs_for_long_input(self, simple_mealy_machine):
+        # S -0/x-> A -0/z-> S -1/y-> B -0/p-> B -1/q-> S
+        outputs = simple_mealy_machine.process_input("00101")
+        assert outputs == ['x', 'z', 'y', 'p', 'q']
+
     def test_out_for_unknown_state(self, simple_mealy_machine):
         assert simple_mealy_machine
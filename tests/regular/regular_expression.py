@@ -1,6 +1,9 @@
+import copy
+import pickle
+
 import pytest
 from src.regular.regular_expression import (
-    RegularExpression, Symbol, EmptyString, EmptySet, RegexUnion, RegexConcat, RegexKleeneStar, make_union, make_concat, make_kleene_star
+    RegularExpression, Symbol, EmptyString, EmptySet, EPS, EMPTY, RegexUnion, RegexConcat, RegexKleeneStar, make_union, make_concat, make_kleene_star
 )
 
 
@@ -27,6 +30,26 @@ class TestSymbol:
         assert a1 != b
         assert a1 != 'a' # Typing error expected
 
+    def test_symbol_interned(self):
+        assert Symbol('a') is Symbol('a')
+        assert Symbol('a') is not Symbol('b')
+
+    def test_symbol_copy_and_pickle(self):
+        a = Symbol('a')
+        assert copy.copy(a) is a
+        assert copy.deepcopy(a) is a
+        assert pickle.loads(pickle.dumps(a)) is a
+
+        union = make_union(a, Symbol('b'))
+        assert str(copy.deepcopy(union)) == str(union)
+        assert str(pickle.loads(pickle.dumps(union))) == str(union)
+
+    def test_symbol_is_read_only(self):
+        a = Symbol('a')
+        with pytest.raises(AttributeError):
+            a.symbol = 'b'
+        assert str(Symbol('a')) == 'a'
+
     def test_symbol_repr(self):
         a = Symbol('a')
         assert repr(a) == "Symbol(a)"
@@ -56,6 +79,10 @@ class TestEmptySymbol:
         assert eps1 == eps2
         assert eps1 != Symbol('a')
 
+    def test_empty_symbol_singleton(self):
+        assert EmptyString() is EmptyString()
+        assert EmptyString() is EPS
+
     def test_empty_symbol_repr(sself):
         eps = EmptyString()
         assert repr(eps) == "EmptyString(ε)"
@@ -79,6 +106,10 @@ class TestEmptySet:
         assert empty1 != Symbol('a')
         assert empty1 != EmptyString()
 
+    def test_empty_set_singleton(self):
+        assert EmptySet() is EmptySet()
+        assert EmptySet() is EMPTY
+
     def test_empty_set_repr(self):
         empty = EmptySet()
         assert repr(empty) == "EmptySet(∅)"
@@ -131,6 +162,14 @@ class TestRegexUnion:
         res = str(outer_union)
         assert res.count('(') <= 1
 
+    def test_union_keeps_parentheses_of_concat_operand(self):
+        a, b, c, d, e = (Symbol(x) for x in 'abcde')
+        concat = RegexConcat(RegexUnion(a, b), RegexUnion(c, d))
+        union = RegexUnion(concat, e)
+
+        assert str(concat) == '(a|b)(c|d)'
+        assert str(union) == '((a|b)(c|d)|e)'
+
 
 class TestRegexConcat:
     """
@@ -293,6 +332,48 @@ class TestFactoryFunctions:
         empty_star = make_kleene_star(empty)
         assert isinstance(empty_star, EmptyString)
 
+    def test_factories_share_equal_nodes(self):
+        a = Symbol('a')
+        b = Symbol('b')
+
+        assert make_union(a, b) is make_union(a, b)
+        assert make_concat(a, b) is make_concat(a, b)
+        assert make_kleene_star(a) is make_kleene_star(a)
+
+    def test_make_union_flattens_duplicates(self):
+        a = Symbol('a')
+        b = Symbol('b')
+
+        union = make_union(a, b)
+        assert make_union(union, a) is union
+        assert make_union(union, make_union(b, a)) is union
+
+    def test_make_kleene_star_idempotent(self):
+        star = make_kleene_star(Symbol('a'))
+        assert make_kleene_star(star) is star
+
+    def test_make_kleene_star_drops_epsilon_alternatives(self):
+        a, b = Symbol('a'), Symbol('b')
+        star = make_kleene_star(make_union(EPS, make_union(a, b)))
+        assert star is make_kleene_star(make_union(a, b))
+        assert str(star) == "(a|b)*"
+        assert make_kleene_star(make_union(a, EPS)) is make_kleene_star(a)
+
+    def test_str_of_deep_expression(self):
+        expr = EPS
+        for _ in range(5000):
+            expr = make_concat(expr, Symbol('a'))
+        assert str(expr) == 'a' * 5000
+
+    def test_nodes_have_no_instance_dict(self):
+        a = Symbol('a')
+        for node in (a, EPS, EMPTY, make_union(a, Symbol('b')), make_concat(a, a), make_kleene_star(a)):
+            assert not hasattr(node, '__dict__')
+
+    def test_str_is_cached(self):
+        star = make_kleene_star(make_union(Symbol('a'), Symbol('b')))
+        assert str(star) is str(star)
+
 
 class TestComplexExpressions:
     """
@@ -1,3 +1,6 @@
+import copy
+import pickle
+
 import pytest
 from src.regular.regular_grammar import RegularGrammar, RegularProduction, GrammarType, make_regular_grammar
 
@@ -40,6 +43,20 @@ class TestRegularGrammarBasicFunctionalities:
         assert not prod_eps.is_terminal_production()
         assert not prod_term.is_epsilon_production()
 
+    def test_production_is_immutable_value(self):
+        prod = RegularProduction.right_linear_production('S', '0', 'A')
+        assert prod == RegularProduction('S', '0', 'A', GrammarType.RIGHT_LINEAR)
+        assert len({prod, RegularProduction('S', '0', 'A', GrammarType.RIGHT_LINEAR)}) == 1
+        with pytest.raises(AttributeError):
+            prod.terminal = '1'
+
+    def test_production_copy_and_pickle(self):
+        prod = RegularProduction.right_linear_production('S', '0', 'A')
+        for clone in (copy.copy(prod), copy.deepcopy(prod), pickle.loads(pickle.dumps(prod))):
+            assert clone == prod
+            assert hash(clone) == hash(prod)
+            assert str(clone) == 'S -> 0A'
+
     def test_invalid_grammar_type(self):
         with pytest.raises(ValueError):
             RegularProduction('A', None, 'B', GrammarType.RIGHT_LINEAR)
@@ -62,6 +79,45 @@ class TestRegularGrammarBasicFunctionalities:
 
         assert grammar.is_valid_regular_grammar()
 
+    def test_productions_for_variable(self):
+        s_to_a = RegularProduction.right_linear_production('S', '0', 'A')
+        a_to_1 = RegularProduction.terminal_production('A', '1', GrammarType.RIGHT_LINEAR)
+        a_to_eps = RegularProduction.epsilon_production('A', GrammarType.RIGHT_LINEAR)
+        grammar = make_regular_grammar(
+            variables={'S', 'A', 'B'},
+            terminals={'0', '1'},
+            productions=[s_to_a, a_to_1, a_to_eps],
+            start_variable='S',
+            grammar_type=GrammarType.RIGHT_LINEAR
+        )
+
+        assert grammar.get_produtions_for_variable('S') == [s_to_a]
+        assert grammar.get_produtions_for_variable('A') == [a_to_1, a_to_eps]
+        assert grammar.get_produtions_for_variable('B') == []
+        assert grammar.get_productions_for_variable('S') == [s_to_a]
+        assert list(grammar.iter_productions_for('A')) == [a_to_1, a_to_eps]
+        assert list(grammar.iter_productions_for('B')) == []
+        assert grammar.get_nullable_variables() == {'A'}
+        assert not grammar.derives_epsilon()
+
+    def test_sets_are_frozen(self):
+        variables = {'S'}
+        productions = [RegularProduction.right_linear_production('S', '0', 'S')]
+        grammar = make_regular_grammar(
+            variables=variables,
+            terminals={'0'},
+            productions=productions,
+            start_variable='S',
+            grammar_type=GrammarType.RIGHT_LINEAR
+        )
+        variables.add('A')
+        productions.insert(0, RegularProduction.epsilon_production('A', GrammarType.RIGHT_LINEAR))
+
+        assert grammar.variables == frozenset({'S'})
+        assert grammar.get_produtions_for_variable('S') == [RegularProduction.right_linear_production('S', '0', 'S')]
+        assert not grammar.derives_epsilon()
+        assert isinstance(grammar.terminals, frozenset)
+
     def test_invalid_start_variable(self):
         with pytest.raises(ValueError):
             RegularGrammar({'S', 'A'}, {'0', '1'}, [], 'B', GrammarType.RIGHT_LINEAR)
@@ -128,6 +184,7 @@ class TestRegularGrammarToAutomaton:
         )
 
         nfa = grammar.to_finite_automaton()
+        assert nfa is grammar.to_finite_automaton()
         assert nfa.accepts('01')
         assert nfa.accepts('001')
         assert not nfa.accepts('10')